@@ -6,28 +6,41 @@ import redis
 import time
 import sqlite3
 import pandas as pd
+import numpy as np
 import math
-import configparser
+from concurrent.futures import ThreadPoolExecutor
 
 # --- 1. CONFIGURATION LOADING (Externalised) ---
 
 CONFIG_FILE = "/opt/Drishyata/config.ini"
 
+@st.cache_resource
 def load_config():
-    """Loads configuration from the external config.ini file."""
-    config = configparser.ConfigParser()
+    """Loads configuration from the external config.ini file (parsed once per process).
+
+    The config is a tiny fixed-schema INI, so a direct key=value scan avoids
+    ConfigParser's section/interpolation machinery entirely.
+    """
     try:
-        if not config.read(CONFIG_FILE):
+        raw = {}
+        with open(CONFIG_FILE) as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith(('#', ';', '[')):
+                    continue
+                key, sep, value = line.partition('=')
+                if sep:
+                    raw[key.strip().upper()] = value.strip()
+        if not raw:
             st.error(f"Configuration file '{CONFIG_FILE}' not found or empty. Using defaults.")
             return {
-                'sentinels': [('127.0.0.1', 26379)],
+                'sentinels': (('127.0.0.1', 26379),),
                 'refresh_seconds': 60,
                 'db_file': "redis_health_history.db"
             }
 
-        sentinels_str = config.get('OBSERVABILITY', 'SENTINELS', fallback='127.0.0.1:26379')
         sentinel_list = []
-        for entry in sentinels_str.split(','):
+        for entry in raw.get('SENTINELS', '127.0.0.1:26379').split(','):
             try:
                 host, port = entry.strip().split(':')
                 sentinel_list.append((host, int(port)))
@@ -35,26 +48,61 @@ def load_config():
                 continue
 
         return {
-            'sentinels': sentinel_list,
-            'refresh_seconds': config.getint('OBSERVABILITY', 'REFRESH_INTERVAL_SECONDS', fallback=60),
-            'db_file': config.get('OBSERVABILITY', 'DB_FILE', fallback='redis_health_history.db')
+            # Tuple: immutable and cheaply hashable as a cache key downstream
+            'sentinels': tuple(sentinel_list),
+            'refresh_seconds': int(raw.get('REFRESH_INTERVAL_SECONDS', 60)),
+            'db_file': raw.get('DB_FILE', 'redis_health_history.db'),
+            'retention_days': int(raw.get('RETENTION_DAYS', 30))
+        }
+    except FileNotFoundError:
+        st.error(f"Configuration file '{CONFIG_FILE}' not found or empty. Using defaults.")
+        return {
+            'sentinels': (('127.0.0.1', 26379),),
+            'refresh_seconds': 60,
+            'db_file': "redis_health_history.db"
         }
     except Exception as e:
         st.error(f"Error loading configuration from {CONFIG_FILE}: {e}")
         return {}
 
 APP_CONFIG = load_config()
-SENTINELS = APP_CONFIG.get('sentinels', [('127.0.0.1', 26379)])
+SENTINELS = APP_CONFIG.get('sentinels', (('127.0.0.1', 26379),))
 REFRESH_INTERVAL_SECONDS = APP_CONFIG.get('refresh_seconds', 60)
 DB_FILE = APP_CONFIG.get('db_file', "redis_health_history.db")
+RETENTION_DAYS = APP_CONFIG.get('retention_days', 30)
 
 # --- Database Functions ---
 
+# Insert statements as module constants: same SQL string object every call, so
+# SQLite's prepared-statement cache always hits
+HEALTH_SQL = """
+    INSERT INTO health_snapshots (timestamp, cluster_name, role, host, port, health, keys, clients, memory, master_host, master_port)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+SENTINEL_SQL = """
+    INSERT INTO sentinel_snapshots (
+        timestamp, host, port, masters_monitored, is_tilt, running_scripts
+    )
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+@st.cache_resource
+def get_conn():
+    """Returns a single long-lived SQLite connection, shared across Streamlit reruns."""
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None, cached_statements=256)
+    # WAL + relaxed sync: one fsync per batch instead of two per commit.
+    # Acceptable durability trade-off for observability snapshots.
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA mmap_size=268435456;")
+    conn.execute("PRAGMA cache_size=-65536;")
+    return conn
+
 def init_db():
     """Initializes the SQLite database and creates the tables if they don't exist."""
-    conn = None
     try:
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_conn()
         cursor = conn.cursor()
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS health_snapshots (
@@ -80,80 +128,173 @@ def init_db():
                 port INTEGER,
                 masters_monitored INTEGER,
                 is_tilt INTEGER,
-                running_scripts INTEGER,
-                total_clusters_monitored INTEGER
+                running_scripts INTEGER
             )
         """)
+        # Migration: drop the redundant total_clusters_monitored column (it
+        # duplicated masters_monitored) from databases created by older versions
+        try:
+            cursor.execute("ALTER TABLE sentinel_snapshots DROP COLUMN total_clusters_monitored")
+        except sqlite3.OperationalError:
+            pass  # column already gone
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        # Indexes so the history view's ORDER BY/filtering is a B-tree walk
+        # instead of a full-table sort
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_health_ts ON health_snapshots(timestamp DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_health_cluster_ts ON health_snapshots(cluster_name, timestamp DESC)")
         conn.commit()
-    except Exception as e:
-        st.error(f"Failed to initialize database: {e}")
-    finally:
-        if conn:
-            conn.close()
 
-def save_health_data(cluster_name, master_node, node_infos):
-    """Saves the collected Redis node health data to the SQLite database."""
-    conn = None
-    try:
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        current_time = time.strftime('%Y-%m-%d %H:%M:%S')
-        master_host, master_port = master_node
-        for info in node_infos:
-            try:
-                keys = info.get('Keys') if info.get('Keys') != 'n/a' else None
-                clients = info.get('Clients') if info.get('Clients') != 'n/a' else None
-                cursor.execute("""
-                    INSERT INTO health_snapshots (timestamp, cluster_name, role, host, port, health, keys, clients, memory, master_host, master_port)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    current_time, cluster_name, info['Role'], info['Host'], info['Port'], info['Health'],
-                    keys, clients, info['Memory'], master_host, master_port
-                ))
-            except Exception:
-                pass
+        # Retention pruning keeps the tables (and their indexes) bounded so
+        # history queries don't slow down as the deployment ages
+        retention = f"-{RETENTION_DAYS} days"
+        cursor.execute("DELETE FROM health_snapshots WHERE timestamp < datetime('now', 'localtime', ?)", (retention,))
+        cursor.execute("DELETE FROM sentinel_snapshots WHERE timestamp < datetime('now', 'localtime', ?)", (retention,))
         conn.commit()
+        cursor.execute("PRAGMA optimize;")
+
+        # VACUUM at most once a week to reclaim pruned pages, tracked in meta
+        week_ago = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(time.time() - 7 * 86400))
+        row = cursor.execute("SELECT value FROM meta WHERE key = 'last_vacuum'").fetchone()
+        if row is None or row[0] < week_ago:
+            cursor.execute("VACUUM")
+            cursor.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('last_vacuum', ?)",
+                (time.strftime('%Y-%m-%d %H:%M:%S'),)
+            )
+            conn.commit()
     except Exception as e:
-        st.error(f"Failed to save data batch to database: {e}")
-    finally:
-        if conn:
-            conn.close()
+        st.error(f"Failed to initialize database: {e}")
+
+def save_refresh_data(health_batches, sentinel_infos):
+    """Saves all clusters' node rows plus the sentinel rows in one transaction.
 
-def save_sentinel_data(sentinel_infos):
-    """Saves the collected sentinel health data to the SQLite database."""
-    conn = None
+    health_batches is a list of (cluster_name, (master_host, master_port),
+    node_infos) triples collected over one refresh cycle. A single
+    BEGIN/executemany/commit means one fsync per cycle, however many clusters
+    are monitored.
+    """
     try:
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_conn()
         cursor = conn.cursor()
         current_time = time.strftime('%Y-%m-%d %H:%M:%S')
-        for info in sentinel_infos:
-            cursor.execute("""
-                INSERT INTO sentinel_snapshots (
-                    timestamp, host, port, masters_monitored, is_tilt, running_scripts, total_clusters_monitored
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
+        health_rows = [
+            (
+                current_time, cluster_name, info['Role'], info['Host'], info['Port'], info['Health'],
+                info.get('Keys') if info.get('Keys') != 'n/a' else None,
+                info.get('Clients') if info.get('Clients') != 'n/a' else None,
+                info['Memory'], master_host, master_port
+            )
+            for cluster_name, (master_host, master_port), node_infos in health_batches
+            for info in node_infos
+        ]
+        sentinel_rows = [
+            (
                 current_time, info['Host'], info['Port'], info['masters_monitored'],
-                info['is_tilt'], info['running_scripts'], info['masters_monitored']
-            ))
+                info['is_tilt'], info['running_scripts']
+            )
+            for info in sentinel_infos
+        ]
+        conn.execute("BEGIN")
+        cursor.executemany(HEALTH_SQL, health_rows)
+        cursor.executemany(SENTINEL_SQL, sentinel_rows)
         conn.commit()
     except Exception as e:
-        st.error(f"Failed to save sentinel data batch to database: {e}")
-    finally:
-        if conn:
-            conn.close()
+        st.error(f"Failed to save data batch to database: {e}")
 
-def get_redis_history_data():
-    conn = sqlite3.connect(DB_FILE)
-    df = pd.read_sql_query("SELECT timestamp, cluster_name, role, host, port, health, keys, clients, memory, master_host, master_port FROM health_snapshots ORDER BY timestamp DESC", conn)
-    conn.close()
-    return df
+HEALTH_HISTORY_COLUMNS = ['timestamp', 'cluster_name', 'role', 'host', 'port', 'health', 'keys', 'clients', 'memory', 'master_host', 'master_port']
+SENTINEL_HISTORY_COLUMNS = ['id', 'timestamp', 'host', 'port', 'masters_monitored', 'is_tilt', 'running_scripts']
+
+def get_redis_history_data(cluster=None, limit=None, offset=0):
+    """Fetches Redis history rows, filtered and paginated in SQL rather than Pandas."""
+    conn = get_conn()
+    sql = f"SELECT {', '.join(HEALTH_HISTORY_COLUMNS)} FROM health_snapshots"
+    params = []
+    if cluster:
+        sql += " WHERE cluster_name = ?"
+        params.append(cluster)
+    sql += " ORDER BY timestamp DESC"
+    if limit is not None:
+        sql += " LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+    # Plain fetchall + from_records skips pd.read_sql_query's per-row
+    # DBAPI/type-inference machinery
+    rows = conn.execute(sql, params).fetchall()
+    return pd.DataFrame.from_records(rows, columns=HEALTH_HISTORY_COLUMNS)
+
+def get_redis_history_count(cluster=None):
+    """Returns the number of Redis history rows matching the optional cluster filter."""
+    conn = get_conn()
+    if cluster:
+        row = conn.execute("SELECT COUNT(*) FROM health_snapshots WHERE cluster_name = ?", (cluster,)).fetchone()
+    else:
+        row = conn.execute("SELECT COUNT(*) FROM health_snapshots").fetchone()
+    return row[0]
+
+def get_redis_cluster_names():
+    """Returns the distinct cluster names present in the history table."""
+    conn = get_conn()
+    return [r[0] for r in conn.execute("SELECT DISTINCT cluster_name FROM health_snapshots")]
+
+@st.cache_data(ttl=60)
+def df_to_csv_bytes(cluster_filter, row_count):
+    """Serializes the filtered history to CSV bytes, cached across reruns.
+
+    row_count is only used as a cache key: when new rows are ingested the
+    count changes and the CSV is rebuilt, otherwise widget interactions
+    reuse the cached bytes instead of re-serializing the whole table.
+    """
+    df = get_redis_history_data(cluster_filter)
+    return df.to_csv(index=False).encode('utf-8')
 
 def get_sentinel_history_data():
-    conn = sqlite3.connect(DB_FILE)
-    df = pd.read_sql_query("SELECT id, timestamp, host, port, masters_monitored, is_tilt, running_scripts FROM sentinel_snapshots ORDER BY timestamp DESC", conn)
-    conn.close()
-    return df
+    conn = get_conn()
+    rows = conn.execute(f"SELECT {', '.join(SENTINEL_HISTORY_COLUMNS)} FROM sentinel_snapshots ORDER BY timestamp DESC").fetchall()
+    return pd.DataFrame.from_records(rows, columns=SENTINEL_HISTORY_COLUMNS)
+
+# --- Helper: Pooled Redis Connections ---
+
+@st.cache_resource
+def get_redis(host, port, socket_timeout=1):
+    """Returns a cached Redis client backed by a connection pool.
+
+    Caching per (host, port) keeps sockets alive across reruns instead of
+    paying a TCP handshake for every probe.
+    """
+    pool = redis.ConnectionPool(
+        host=host, port=port, decode_responses=True,
+        socket_timeout=socket_timeout, max_connections=4
+    )
+    return redis.StrictRedis(connection_pool=pool)
+
+# --- Helper: Node Probing ---
+
+def probe_node(host, port, role):
+    """Probes a single Redis node and returns its health/stats row."""
+    try:
+        r = get_redis(host, port)
+        # One pipelined round-trip instead of three separate ones
+        pipe = r.pipeline(transaction=False)
+        pipe.info()
+        pipe.dbsize()
+        pipe.ping()
+        info, dbsize, pong = pipe.execute()
+        clients = info.get('connected_clients', 'n/a')
+        mem = info.get('used_memory_human', 'n/a')
+        status = 'Healthy' if pong else 'Unhealthy'
+        return {
+            'Role': role, 'Host': host, 'Port': port, 'Health': status,
+            'Keys': dbsize, 'Clients': clients, 'Memory': mem,
+        }
+    except Exception:
+        return {
+            'Role': role, 'Host': host, 'Port': port,
+            'Health': 'Down/Error', 'Keys': 'n/a', 'Clients': 'n/a', 'Memory': 'n/a',
+        }
 
 # --- Helper: Direct Sentinel Connection ---
 
@@ -161,201 +302,232 @@ def get_sentinel_connection():
     """Tries to connect to the first available Sentinel and returns the connection object."""
     for host, port in SENTINELS:
         try:
-            r = redis.StrictRedis(host=host, port=port, decode_responses=True, socket_timeout=2)
+            r = get_redis(host, port, socket_timeout=2)
             if r.ping():
                 return r
         except Exception:
             continue
     return None
 
+@st.cache_data(ttl=30)
+def discover_topology():
+    """Discovers the master/slave topology from Sentinel, cached with a short TTL.
+
+    Topology changes far less often than the refresh interval, so re-asking
+    Sentinel every rerun is wasted round-trips. Returns None when no Sentinel
+    is reachable; callers should clear the cache on discovery errors so a
+    failover is picked up immediately.
+    """
+    conn = get_sentinel_connection()
+    if not conn:
+        return None
+    masters = conn.sentinel_masters()
+    return {name: (m, conn.sentinel_slaves(name)) for name, m in masters.items()}
+
 # --- UI/UX & Observability Helpers ---
 
 def format_health_metric(label, value, is_critical=False):
-    """Helper to display key metrics using Streamlit metric/markdown for eye-catchy observability."""
-    icon = "✅" if value == 'Healthy' else ("❌" if value in ['Down/Error', 'Unhealthy', 'Error'] else "⚠️" if is_critical or value == 'Discovery Error' else "📊")
-    color = "green" if value == 'Healthy' else ("red" if value in ['Down/Error', 'Unhealthy', 'Error', 'Discovery Error'] else ("orange" if is_critical else "grey"))
-
-    st.markdown(f"""
-        <div style='
-            padding: 10px;
-            margin: 5px 0;
-            border-radius: 5px;
-            border-left: 5px solid {color};
-            background-color: #f0f2f6;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        '>
-            <small style='color: #6c757d;'>{label}</small><br>
-            <strong style='font-size: 1.2em; color: black;'>{icon} {value}</strong>
-        </div>
-    """, unsafe_allow_html=True)
-
-# Function for Styler.map
-def style_health_status(val):
-    if val in ['Down/Error', 'Unhealthy', 'Error']:
-        return 'background-color: #f7d7d7'  # Reddish for errors
-    elif val == 'Healthy':
-        return 'background-color: #d7f7d7' # Greenish for healthy
-    return ''
-
-# --- View Functions ---
-
-def live_monitor_view(placeholder):
-    """Fetches and displays Redis health data with enhanced UI/UX."""
+    """Helper to display key metrics using native st.metric for eye-catchy observability.
 
-    with placeholder.container():
-        # --- HEADING CHANGE ---
-        st.header("💾 Live Redis Cluster Observability")
-        # ----------------------
-
-        sentinel_conn = get_sentinel_connection()
+    st.metric talks Streamlit's component protocol directly — no raw-HTML
+    sanitizing/diffing per metric per refresh like the old markdown block.
+    """
+    icon = "✅" if value == 'Healthy' else ("❌" if value in ['Down/Error', 'Unhealthy', 'Error'] else "⚠️" if is_critical or value == 'Discovery Error' else "📊")
+    st.metric(label=label, value=f"{icon} {value}", delta=None, delta_color="inverse" if is_critical else "normal")
 
-        if not sentinel_conn:
-            st.error("❌ Critical: Could not connect to ANY configured Sentinel nodes.")
-            return
+# Function for Styler.apply: styles the whole column in one vectorized pass
+# instead of one Python call per cell
+def style_health_col(s):
+    return np.where(
+        s.isin(['Down/Error', 'Unhealthy', 'Error']), 'background-color: #f7d7d7',  # Reddish for errors
+        np.where(s == 'Healthy', 'background-color: #d7f7d7', '')  # Greenish for healthy
+    ).tolist()
 
-        monitored_masters = {}
-        try:
-            monitored_masters = sentinel_conn.sentinel_masters()
-        except Exception as e:
-            st.error(f"Error fetching masters list: {e}")
-            return
-
-        if not monitored_masters:
-            st.warning("⚠️ Sentinel is reachable, but is not monitoring any masters.")
-            return
-
-        sentinel_infos = []
-
-        # Iterate through every discovered cluster
-        for master_name, master_data in monitored_masters.items():
-
-            master_ip = master_data.get('ip')
-            master_port = master_data.get('port')
-            master_status = 'N/A'
-            slave_count = 0
-            keys_count = 0
-            total_memory = 'N/A'
-            node_infos = []
-
-            if master_ip and master_port:
-                master_node = (master_ip, master_port)
-                slaves = []
-                try:
-                    slaves_data = sentinel_conn.sentinel_slaves(master_name)
-                    slave_count = len(slaves_data)
-                    for slave in slaves_data:
-                        slaves.append((slave.get('ip'), slave.get('port')))
-
-                    all_nodes = [(master_ip, master_port, 'Master')] + [(h, p, 'Slave') for h, p in slaves]
-
-                    # Gather detailed info for all nodes
-                    for host, port, role in all_nodes:
-                        try:
-                            r = redis.StrictRedis(host=host, port=port, decode_responses=True, socket_timeout=1)
-                            info = r.info()
-                            dbsize = r.dbsize()
-                            clients = info.get('connected_clients', 'n/a')
-                            mem = info.get('used_memory_human', 'n/a')
-                            status = 'Healthy' if r.ping() else 'Unhealthy'
-
-                            node_info = {
-                                'Role': role, 'Host': host, 'Port': port, 'Health': status,
-                                'Keys': dbsize, 'Clients': clients, 'Memory': mem,
-                            }
-                            node_infos.append(node_info)
-
-                            if role == 'Master':
-                                master_status = status
-                                keys_count = dbsize
-                                total_memory = mem
-
-                        except Exception:
-                            node_infos.append({
-                                'Role': role, 'Host': host, 'Port': port,
-                                'Health': 'Down/Error', 'Keys': 'n/a', 'Clients': 'n/a', 'Memory': 'n/a',
-                            })
-                            if role == 'Master':
-                                master_status = 'Down/Error'
-
-                except Exception:
-                    master_status = 'Discovery Error'
-
-                save_health_data(master_name, master_node, node_infos)
-
-                # --- START: CLUSTER VISIBLE DETAILS ---
-
-                st.subheader(f"Cluster: **{master_name}**")
-
-                # OBSERVABILITY: Use metric style for key parameters (ALWAYS VISIBLE)
-                col1, col2, col3, col4 = st.columns(4)
-                with col1: format_health_metric("Master Health", master_status, is_critical=master_status != 'Healthy')
-                with col2: format_health_metric("Keys (Master)", f"{keys_count:,}" if isinstance(keys_count, int) else str(keys_count), is_critical=False)
-                with col3: format_health_metric("Used Memory (Master)", total_memory, is_critical=False)
-                with col4: format_health_metric("Slaves Count", slave_count, is_critical=slave_count < 1)
-
-                # --- START: NODE DETAILS EXPANDER (NEW) ---
-                with st.expander("Show Node Details Table"):
-                    # Display the Node Details Table (NOW INSIDE EXPANDER)
-                    st.dataframe(
-                        pd.DataFrame(node_infos).style.map(style_health_status, subset=['Health']),
-                        hide_index=True,
-                        width='stretch',
-                        column_order=['Role', 'Host', 'Port', 'Health', 'Keys', 'Clients', 'Memory'] # Ensure order
-                    )
-                # --- END: NODE DETAILS EXPANDER ---
+# --- View Functions ---
 
-                st.markdown("---") # Separator between clusters
+# Adaptive polling: back off while everything stays healthy, snap back on trouble
+POLL_HEALTHY_STREAK = 3          # healthy cycles before doubling the interval
+POLL_MAX_INTERVAL_FACTOR = 8     # never poll slower than 8x the configured interval
+
+def update_poll_interval(all_healthy):
+    """Doubles the polling interval after a streak of all-healthy cycles (up to a
+    cap) and resets it to the configured minimum as soon as anything is unhealthy."""
+    interval = st.session_state.get('poll_interval', REFRESH_INTERVAL_SECONDS)
+    streak = st.session_state.get('healthy_streak', 0)
+    if all_healthy:
+        streak += 1
+        if streak >= POLL_HEALTHY_STREAK:
+            interval = min(interval * 2, REFRESH_INTERVAL_SECONDS * POLL_MAX_INTERVAL_FACTOR)
+            streak = 0
+    else:
+        interval = REFRESH_INTERVAL_SECONDS
+        streak = 0
+    changed = interval != st.session_state.get('poll_interval', REFRESH_INTERVAL_SECONDS)
+    st.session_state['poll_interval'] = interval
+    st.session_state['healthy_streak'] = streak
+    if changed:
+        # Full rerun so the fragment is re-created with the new run_every
+        st.rerun()
 
-                # --- END: CLUSTER VISIBLE DETAILS ---
+@st.fragment(run_every=st.session_state.get('poll_interval', REFRESH_INTERVAL_SECONDS) if REFRESH_INTERVAL_SECONDS > 0 else None)
+def live_monitor_view():
+    """Fetches and displays Redis health data with enhanced UI/UX.
 
+    Runs as an auto-refreshing fragment: only this panel re-executes on each
+    refresh tick, not the whole script (config load, sidebar, DB init).
+    """
 
-        # -------------------------------------
-        # Global Sentinel Status
-        # -------------------------------------
-        st.subheader("🛡️ Sentinel Network Health")
+    # --- HEADING CHANGE ---
+    st.header("💾 Live Redis Cluster Observability")
+    # ----------------------
 
-        for host, port in SENTINELS:
+    try:
+        topology = discover_topology()
+    except Exception as e:
+        # Drop the cached topology so the next rerun rediscovers (e.g. after failover)
+        discover_topology.clear()
+        st.error(f"Error fetching masters list: {e}")
+        return
+
+    if topology is None:
+        st.error("❌ Critical: Could not connect to ANY configured Sentinel nodes.")
+        return
+
+    if not topology:
+        st.warning("⚠️ Sentinel is reachable, but is not monitoring any masters.")
+        return
+
+    sentinel_infos = []
+    health_batches = []
+    all_healthy = True
+
+    # Iterate through every discovered cluster
+    for master_name, (master_data, slaves_data) in topology.items():
+
+        master_ip = master_data.get('ip')
+        master_port = master_data.get('port')
+        master_status = 'N/A'
+        slave_count = 0
+        keys_count = 0
+        total_memory = 'N/A'
+        node_infos = []
+
+        if master_ip and master_port:
+            master_node = (master_ip, master_port)
+            slaves = []
             try:
-                rs = redis.StrictRedis(host=host, port=port, decode_responses=True, socket_timeout=1)
-                s_info = rs.info('sentinel')
-                status = 'Healthy' if rs.ping() else 'Unhealthy'
-
-                info_row = {
-                    'Host': host, 'Port': port, 'Status': status,
-                    'masters_monitored': s_info.get('sentinel_masters', 0),
-                    'is_tilt': s_info.get('sentinel_tilt', 0),
-                    'running_scripts': s_info.get('sentinel_running_scripts', 0),
-                }
-                sentinel_infos.append(info_row)
+                slave_count = len(slaves_data)
+                for slave in slaves_data:
+                    slaves.append((slave.get('ip'), slave.get('port')))
+
+                all_nodes = [(master_ip, master_port, 'Master')] + [(h, p, 'Slave') for h, p in slaves]
+
+                # Probe all nodes in parallel: wall time becomes the slowest
+                # node's RTT instead of the sum of every node's RTTs.
+                with ThreadPoolExecutor(max_workers=32) as executor:
+                    node_infos = list(executor.map(lambda args: probe_node(*args), all_nodes))
+
+                for node_info in node_infos:
+                    if node_info['Health'] != 'Healthy':
+                        all_healthy = False
+                    if node_info['Role'] == 'Master':
+                        master_status = node_info['Health']
+                        if master_status != 'Down/Error':
+                            keys_count = node_info['Keys']
+                            total_memory = node_info['Memory']
 
             except Exception:
-                sentinel_infos.append({
-                    'Host': host, 'Port': port, 'Status': 'Error',
-                    'masters_monitored': 0, 'is_tilt': 1, 'running_scripts': 0
-                })
+                master_status = 'Discovery Error'
+                all_healthy = False
+
+            health_batches.append((master_name, master_node, node_infos))
 
-        if sentinel_infos:
-            save_sentinel_data(sentinel_infos)
-            sentinel_df = pd.DataFrame(sentinel_infos)
+            # --- START: CLUSTER VISIBLE DETAILS ---
 
-            col1_s, col2_s, col3_s = st.columns(3)
-            healthy_sentinels = len(sentinel_df[sentinel_df['Status'] == 'Healthy'])
-            tilt_count = sentinel_df['is_tilt'].sum()
+            st.subheader(f"Cluster: **{master_name}**")
 
-            with col1_s: format_health_metric("Active Sentinels", f"{healthy_sentinels}/{len(SENTINELS)}", is_critical=healthy_sentinels == 0)
-            with col2_s: format_health_metric("Total Masters Monitored", sentinel_df['masters_monitored'].max(), is_critical=False)
-            with col3_s: format_health_metric("Tilt/Script Issues", tilt_count, is_critical=tilt_count > 0)
+            # OBSERVABILITY: Use metric style for key parameters (ALWAYS VISIBLE)
+            col1, col2, col3, col4 = st.columns(4)
+            with col1: format_health_metric("Master Health", master_status, is_critical=master_status != 'Healthy')
+            with col2: format_health_metric("Keys (Master)", f"{keys_count:,}" if isinstance(keys_count, int) else str(keys_count), is_critical=False)
+            with col3: format_health_metric("Used Memory (Master)", total_memory, is_critical=False)
+            with col4: format_health_metric("Slaves Count", slave_count, is_critical=slave_count < 1)
 
-            with st.expander("Sentinel Detail Table"):
+            # --- START: NODE DETAILS EXPANDER (NEW) ---
+            with st.expander("Show Node Details Table"):
+                # Display the Node Details Table (NOW INSIDE EXPANDER)
                 st.dataframe(
-                    sentinel_df.style.map(style_health_status, subset=['Status']),
+                    pd.DataFrame(node_infos).style.apply(style_health_col, subset=['Health']),
                     hide_index=True,
-                    width='stretch'
+                    width='stretch',
+                    column_order=['Role', 'Host', 'Port', 'Health', 'Keys', 'Clients', 'Memory'] # Ensure order
                 )
+            # --- END: NODE DETAILS EXPANDER ---
 
+            st.markdown("---") # Separator between clusters
 
-        st.markdown("---")
-        st.caption(f"Last updated: **{time.strftime('%Y-%m-%d %H:%M:%S')}** | Auto-refresh: **{REFRESH_INTERVAL_SECONDS}s**")
+            # --- END: CLUSTER VISIBLE DETAILS ---
+
+
+    # -------------------------------------
+    # Global Sentinel Status
+    # -------------------------------------
+    st.subheader("🛡️ Sentinel Network Health")
+
+    for host, port in SENTINELS:
+        try:
+            rs = get_redis(host, port)
+            pipe = rs.pipeline(transaction=False)
+            pipe.info('sentinel')
+            pipe.ping()
+            s_info, pong = pipe.execute()
+            status = 'Healthy' if pong else 'Unhealthy'
+
+            info_row = {
+                'Host': host, 'Port': port, 'Status': status,
+                'masters_monitored': s_info.get('sentinel_masters', 0),
+                'is_tilt': s_info.get('sentinel_tilt', 0),
+                'running_scripts': s_info.get('sentinel_running_scripts', 0),
+            }
+            sentinel_infos.append(info_row)
+
+        except Exception:
+            sentinel_infos.append({
+                'Host': host, 'Port': port, 'Status': 'Error',
+                'masters_monitored': 0, 'is_tilt': 1, 'running_scripts': 0
+            })
+
+    # One transaction for everything gathered this cycle
+    save_refresh_data(health_batches, sentinel_infos)
+
+    if sentinel_infos:
+        # Three scalars from a handful of dicts: one plain pass beats
+        # constructing a DataFrame just to aggregate it
+        healthy_sentinels = sum(1 for info in sentinel_infos if info['Status'] == 'Healthy')
+        tilt_count = sum(info['is_tilt'] for info in sentinel_infos)
+        max_masters = max((info['masters_monitored'] for info in sentinel_infos), default=0)
+
+        col1_s, col2_s, col3_s = st.columns(3)
+        with col1_s: format_health_metric("Active Sentinels", f"{healthy_sentinels}/{len(SENTINELS)}", is_critical=healthy_sentinels == 0)
+        with col2_s: format_health_metric("Total Masters Monitored", max_masters, is_critical=False)
+        with col3_s: format_health_metric("Tilt/Script Issues", tilt_count, is_critical=tilt_count > 0)
+
+        with st.expander("Sentinel Detail Table"):
+            # DataFrame built only for the detail table itself
+            st.dataframe(
+                pd.DataFrame(sentinel_infos).style.apply(style_health_col, subset=['Status']),
+                hide_index=True,
+                width='stretch'
+            )
+
+
+    if any(info['Status'] != 'Healthy' for info in sentinel_infos):
+        all_healthy = False
+
+    update_poll_interval(all_healthy)
+
+    st.markdown("---")
+    st.caption(f"Last updated: **{time.strftime('%Y-%m-%d %H:%M:%S')}** | Auto-refresh: **{st.session_state.get('poll_interval', REFRESH_INTERVAL_SECONDS)}s**")
 
 def display_history_view(placeholder):
     """Displays history with improved UI for large datasets."""
@@ -367,21 +539,18 @@ def display_history_view(placeholder):
 
         with tab1:
             st.subheader("Redis Cluster Node History")
-            history_df = get_redis_history_data()
+            unique_clusters = get_redis_cluster_names()
 
-            if history_df.empty:
+            if not unique_clusters:
                 st.info("No historical Redis Node data found.")
             else:
                 col_filt, col_info = st.columns([1, 4])
 
                 with col_filt:
-                    unique_clusters = history_df['cluster_name'].unique()
-                    selected_cluster = st.selectbox("Filter by Cluster Name", options=['All'] + list(unique_clusters), key="redis_cluster_filter")
-
-                if selected_cluster != 'All':
-                    history_df = history_df[history_df['cluster_name'] == selected_cluster]
+                    selected_cluster = st.selectbox("Filter by Cluster Name", options=['All'] + unique_clusters, key="redis_cluster_filter")
 
-                total_records = len(history_df)
+                cluster_filter = None if selected_cluster == 'All' else selected_cluster
+                total_records = get_redis_history_count(cluster_filter)
                 total_pages = math.ceil(total_records / PAGE_SIZE)
 
                 with col_info:
@@ -391,9 +560,10 @@ def display_history_view(placeholder):
                 with col_select:
                     selected_page = st.selectbox("Select Page", options=range(1, total_pages + 1), index=0, key="redis_page_select") if total_pages > 0 else 1
 
+                # Only the selected page is pulled from SQLite; the ORDER BY/LIMIT
+                # ride the timestamp indexes instead of materializing the whole table
                 start_index = (selected_page - 1) * PAGE_SIZE
-                end_index = start_index + PAGE_SIZE
-                page_df = history_df.iloc[start_index:end_index]
+                page_df = get_redis_history_data(cluster_filter, limit=PAGE_SIZE, offset=start_index)
 
                 st.dataframe(
                     page_df,
@@ -403,9 +573,11 @@ def display_history_view(placeholder):
                 )
 
                 with col_download:
+                    # Callable data: CSV is only materialized when the user
+                    # actually clicks download, not on every tab render
                     st.download_button(
                         label="⬇️ Download Full History CSV",
-                        data=history_df.to_csv(index=False).encode('utf-8'),
+                        data=lambda: df_to_csv_bytes(cluster_filter, total_records),
                         file_name=f'redis_history_{time.strftime("%Y%m%d")}.csv',
                         mime='text/csv',
                     )
@@ -424,7 +596,7 @@ def display_history_view(placeholder):
                 )
                 st.download_button(
                     label="⬇️ Download Sentinel History CSV",
-                    data=history_df.to_csv(index=False).encode('utf-8'),
+                    data=lambda: history_df.to_csv(index=False).encode('utf-8'),
                     file_name=f'sentinel_history_{time.strftime("%Y%m%d")}.csv',
                     mime='text/csv',
                 )
@@ -465,10 +637,7 @@ if 'db_init' not in st.session_state:
 main_placeholder = st.empty()
 
 if view_selection == 'Live Monitor':
-    live_monitor_view(main_placeholder)
-
-    if REFRESH_INTERVAL_SECONDS > 0:
-        time.sleep(REFRESH_INTERVAL_SECONDS)
-        st.rerun()
+    # The fragment's run_every drives auto-refresh; no full-script rerun needed
+    live_monitor_view()
 else:
     display_history_view(main_placeholder)